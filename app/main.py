@@ -1,92 +1,156 @@
 import pyspark
+from pyspark import StorageLevel
 from pyspark.sql import SparkSession
+from pyspark.sql.functions import broadcast, col, count, lit, sum as _sum
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Final
 
-JDBC_DRIVER_PATH = "/app/postgresql-42.7.8.jar"
+import jdbc
+
+# Драйвер лежит в пакете jdbc рядом со скриптом и не зависит от текущего каталога.
+JDBC_DRIVER_FILENAME = "postgresql-42.7.8.jar"
+JDBC_DRIVER_PATH = str(Path(jdbc.__file__).resolve().parent / JDBC_DRIVER_FILENAME)
 
 HADOOP_HOME_PATH = "C:\\hadoop"
 
-def main():
-    print("[ИНФО] Запуск Python скрипта внутри Docker...")
-    spark = SparkSession.builder \
-        .appName("Pagila SQL Analysis") \
-        .config("spark.jars", JDBC_DRIVER_PATH) \
-        .config("spark.driver.extraClassPath", JDBC_DRIVER_PATH) \
-        .getOrCreate()
+# PAGILA_PUSHDOWN=0 выполняет запросы в Spark по таблицам, загруженным через JDBC.
+PUSHDOWN_TO_POSTGRES = os.environ.get("PAGILA_PUSHDOWN", "1") != "0"
 
-    spark.sparkContext.setLogLevel("WARN")
+# Число партиций shuffle (в том числе начальное для AQE) совпадает с числом
+# партиций, на которые заранее распределены rental и inventory.
+SHUFFLE_PARTITIONS = 16
 
-    jdbc_url = "jdbc:postgresql://pagila:5432/postgres"
+# Запросы 1, 4 и 6 в Spark построены через DataFrame API с явным broadcast();
+# в PostgreSQL уходит их SQL вариант.
 
-    db_properties = {
-        "user": "postgres",
-        "password": "123456",
-        "driver": "org.postgresql.Driver"
-    }
+# 1. Количество фильмов в каждой категории, отсортированное по убыванию.
+def film_counts_df(spark):
+    return spark.table("film_category") \
+        .join(broadcast(spark.table("category")), "category_id") \
+        .groupBy("name") \
+        .agg(count("film_id").alias("film_count")) \
+        .select(col("name").alias("category_name"), "film_count") \
+        .orderBy(col("film_count").desc())
 
-    tables_to_load = [
-        "actor", "category", "film", "film_actor", "film_category",
-        "inventory", "rental", "payment", "customer", "address", "city"
-    ]
+# 4. Названия фильмов, которых нет в инвентаре.
+# В Spark это broadcast left anti join по уникальным film_id из инвентаря;
+# в PostgreSQL нет LEFT ANTI JOIN, поэтому туда уходит NOT EXISTS.
+def missing_films_df(spark):
+    return spark.table("film") \
+        .join(broadcast(spark.table("inventory").select("film_id").distinct()), "film_id", "left_anti") \
+        .select("title")
 
-    try:
-        print("\n[ИНФО] Подключение к базе данных и загрузка таблиц...")
-        for table in tables_to_load:
-            spark.read.jdbc(url=jdbc_url, table=f"public.{table}", properties=db_properties) \
-                 .createOrReplaceTempView(table)
-        print("[ИНФО] Все таблицы успешно загружены и готовы к запросам!\n")
-
-    except Exception as e:
-        print(f"\n[КРИТИЧЕСКАЯ ОШИБКА] Не удалось подключиться к базе данных.\nДетали ошибки: {e}")
-        print(f"Детали: {e}")        
-        spark.stop()
-        sys.exit(1)
+# 6. Города с количеством активных и неактивных клиентов, сортировка по неактивным.
+def customers_by_city_df(spark):
+    active = col("activebool").cast("int")
+    return spark.table("customer") \
+        .join(broadcast(spark.table("address")), "address_id") \
+        .join(broadcast(spark.table("city")), "city_id") \
+        .groupBy("city") \
+        .agg(_sum(active).alias("active_customers"),
+             (count(lit(1)) - _sum(active)).alias("inactive_customers")) \
+        .orderBy(col("active_customers").desc(), col("city")) \
+        .limit(20)
 
-    def run_query(title, sql_query):
-        print(f"--- {title} ---")
-        try:
-            spark.sql(sql_query).show(truncate=False)
-        except Exception as e:
-            print(f"Ошибка выполнения запроса: {e}")
-        print("-" * 50 + "\n")
+# 5. Общие части запроса: фильмы категории Children и выбор трех лучших мест.
+CHILDREN_FILMS_CTE = """
+        WITH children_films AS (
+            SELECT /*+ BROADCAST(category) */ film_category.film_id
+                FROM film_category JOIN category ON film_category.category_id = category.category_id
+                WHERE category.name = 'Children'
+        )"""
 
+TOP_ACTORS_SELECT = """
+        SELECT first_name, last_name, film_count
+            FROM (
+                SELECT first_name, last_name, film_count, DENSE_RANK() OVER (ORDER BY film_count DESC) AS rnk
+                    FROM actor_film_counts
+                ) AS ranked_actors
+            WHERE rnk <= 3
+            ORDER BY film_count DESC, first_name
+    """
+
+# 7. Фильтр по городам применяется в CTE cities до всех соединений. Соединение
+# rental и inventory стоит первым, чтобы подсказка SHUFFLE_HASH относилась именно к
+# нему, а маленькие customer/address/cities присоединялись через broadcast.
+# Минуты суммируются целыми числами, в часы переводится только итоговая строка.
+GROUPED_HOURS_CTE = """
+        WITH cities AS (
+  SELECT city_id, CASE
+    WHEN city LIKE 'a%' THEN 'Starts with a'
+    WHEN city LIKE '%-%' THEN 'Contains hyphen'
+  END AS city_group
+    FROM city
+    WHERE city LIKE 'a%' OR city LIKE '%-%'
+),
+grouped_data AS (
+  SELECT /*+ BROADCAST(category, cities, address, customer), SHUFFLE_HASH(rental, inventory) */ category.name AS category_name, cities.city_group,
+  SUM(film.length) AS total_minutes
+    FROM rental
+      JOIN inventory ON inventory.inventory_id = rental.inventory_id
+      JOIN customer ON customer.customer_id = rental.customer_id
+      JOIN address ON address.address_id = customer.address_id
+      JOIN cities ON cities.city_id = address.city_id
+      JOIN film ON film.film_id = inventory.film_id
+      JOIN film_category ON film_category.film_id = film.film_id
+      JOIN category ON category.category_id = film_category.category_id
+    GROUP BY cities.city_group, category.name
+)
+"""
+
+# Каждый запрос: (заголовок, Spark SQL или функция, строящая DataFrame,
+# SQL для PostgreSQL или None, если подходит первый вариант).
+# Подсказки /*+ BROADCAST(...) */ в запросах рассылают маленькие справочники
+# на исполнители вместо shuffle большой таблицы, а SHUFFLE_HASH(...) убирает
+# сортировку при соединении таблиц фактов. PostgreSQL считает их комментариями.
+QUERIES: Final = (
     # 1. Количество фильмов в каждой категории, отсортированное по убыванию.
-    run_query("1. Количество фильмов в категориях", """
+    ("1. Количество фильмов в категориях", film_counts_df, """
         SELECT name AS category_name, COUNT(film_category.film_id) AS film_count
             FROM category JOIN film_category ON category.category_id = film_category.category_id
             GROUP BY category.name
             ORDER BY film_count DESC
-    """)
+    """),
 
     # 2. 10 актеров, чьи фильмы арендовали больше всего, отсортированные по убыванию.
-    run_query("2. Топ-10 актеров по числу аренд", """
-        SELECT actor.first_name AS actor_first_name, actor.last_name AS actor_last_name, COUNT(rental.rental_id) AS rental_count
-            FROM actor JOIN (film_actor JOIN (inventory JOIN
-                rental ON inventory.inventory_id = rental.inventory_id) ON film_actor.film_id = inventory.film_id)
-            ON actor.actor_id = film_actor.actor_id
+    # Аренды сначала агрегируются по фильмам, и с актерами соединяется уже свернутый результат.
+    ("2. Топ-10 актеров по числу аренд", """
+        SELECT /*+ BROADCAST(actor, film_actor) */ actor.first_name AS actor_first_name, actor.last_name AS actor_last_name, CAST(SUM(film_rentals.film_rental_count) AS BIGINT) AS rental_count
+            FROM actor
+                JOIN film_actor ON actor.actor_id = film_actor.actor_id
+                JOIN (
+                    SELECT /*+ SHUFFLE_HASH(inventory, rental) */ inventory.film_id, COUNT(rental.rental_id) AS film_rental_count
+                        FROM inventory JOIN rental ON inventory.inventory_id = rental.inventory_id
+                        GROUP BY inventory.film_id
+                ) AS film_rentals ON film_actor.film_id = film_rentals.film_id
         GROUP BY actor.actor_id, actor.first_name, actor.last_name
         ORDER BY rental_count DESC
         LIMIT 10
-    """)
+    """, None),
 
     # 3. Категория фильмов, на которую потратили больше всего денег.
-    run_query("3. Самая прибыльная категория", """
-        SELECT category.name AS category_name, SUM(payment.amount) AS total_spent
-            FROM payment JOIN 
-                (rental JOIN
-                    (inventory JOIN 
-	                    (film_category JOIN category ON film_category.category_id = category.category_id) 
-	                    ON inventory.film_id = film_category.film_id) 
-                    ON rental.inventory_id = inventory.inventory_id) 
-                ON payment.rental_id = rental.rental_id
+    # Платежи сворачиваются до выручки по фильму до соединения со справочниками категорий.
+    ("3. Самая прибыльная категория", """
+        SELECT /*+ BROADCAST(category, film_category) */ category.name AS category_name, SUM(film_revenue.amount) AS total_spent
+            FROM category
+                JOIN film_category ON category.category_id = film_category.category_id
+                JOIN (
+                    SELECT /*+ SHUFFLE_HASH(rental, inventory, payment) */ inventory.film_id, SUM(payment.amount) AS amount
+                        FROM rental
+                            JOIN inventory ON rental.inventory_id = inventory.inventory_id
+                            JOIN payment ON payment.rental_id = rental.rental_id
+                        GROUP BY inventory.film_id
+                ) AS film_revenue ON film_category.film_id = film_revenue.film_id
             GROUP BY category.name
             ORDER BY total_spent DESC
             LIMIT 1
-    """)
+    """, None),
 
     # 4. Названия фильмов, которых нет в инвентаре.
-    run_query("4. Фильмы отсутствующие в инвентаре", """
+    ("4. Фильмы отсутствующие в инвентаре", missing_films_df, """
         SELECT film.title
             FROM film
             WHERE
@@ -95,70 +159,229 @@ def main():
                         FROM inventory
                         WHERE inventory.film_id = film.film_id
    )
-    """)
+    """),
 
     # 5. Топ 3 актера, которые больше всего снимались в фильмах категории “Children”.
-    run_query("5. Топ актеры в категории 'Children'", """
-        SELECT first_name, last_name, film_count
-            FROM (
-                SELECT first_name, last_name, film_count, DENSE_RANK() OVER (ORDER BY film_count DESC) AS rnk
-                    FROM (
-                        SELECT actor.actor_id, actor.first_name, actor.last_name, COUNT(film_actor.film_id) AS film_count
-                            FROM actor JOIN (film_actor JOIN (film_category JOIN category ON film_category.category_id = category.category_id) 
-	                        ON film_actor.film_id = film_category.film_id) 
-	                        ON actor.actor_id = film_actor.actor_id
-                    WHERE category.name = 'Children'
-                    GROUP BY actor.actor_id, actor.first_name, actor.last_name
-                    ) AS actor_film_counts 
-                ) AS ranked_actors 
-            WHERE rnk <= 3
-            ORDER BY film_count DESC, first_name
-    """)
+    # Фильтр по категории сначала сводится к списку фильмов children_films, и film_actor
+    # отсекается по нему до соединения с актерами: в Spark явным broadcast LEFT SEMI JOIN,
+    # в PostgreSQL, где такого синтаксиса нет, через IN.
+    ("5. Топ актеры в категории 'Children'", CHILDREN_FILMS_CTE + """,
+        actor_film_counts AS (
+            SELECT /*+ BROADCAST(children_films, actor) */ actor.actor_id, actor.first_name, actor.last_name, COUNT(film_actor.film_id) AS film_count
+                FROM film_actor
+                    LEFT SEMI JOIN children_films ON film_actor.film_id = children_films.film_id
+                    JOIN actor ON actor.actor_id = film_actor.actor_id
+                GROUP BY actor.actor_id, actor.first_name, actor.last_name
+        )""" + TOP_ACTORS_SELECT, CHILDREN_FILMS_CTE + """,
+        actor_film_counts AS (
+            SELECT actor.actor_id, actor.first_name, actor.last_name, COUNT(film_actor.film_id) AS film_count
+                FROM actor JOIN film_actor ON actor.actor_id = film_actor.actor_id
+                WHERE film_actor.film_id IN (SELECT film_id FROM children_films)
+                GROUP BY actor.actor_id, actor.first_name, actor.last_name
+        )""" + TOP_ACTORS_SELECT),
 
     # 6. Города с количеством активных и неактивных клиентов, сортировка по неактивным.
-    run_query("6. Активные/неактивные клиенты по городам", """
+    ("6. Активные/неактивные клиенты по городам", customers_by_city_df, """
         SELECT
             city.city,
-            SUM(CASE WHEN cu.activebool = true THEN 1 ELSE 0 END) AS active_customers,
-            SUM(CASE WHEN cu.activebool = false THEN 1 ELSE 0 END) AS inactive_customers
+            SUM(CAST(cu.activebool AS INT)) AS active_customers,
+            COUNT(*) - SUM(CAST(cu.activebool AS INT)) AS inactive_customers
             FROM city
                 JOIN address ON city.city_id = address.city_id
                 JOIN customer cu ON address.address_id = cu.address_id
             GROUP BY city.city
             ORDER BY active_customers DESC, city.city
             LIMIT 20 
-    """)
+    """),
 
     # 7. Выведите категорию фильмов с наибольшим общим количеством часов проката в городах (адрес_клиента в этом городе), которые начинаются с буквы «a». Сделайте то же самое для городов с символом «-».
-    run_query("7. Выведите категорию фильмов с наибольшим общим количеством часов проката в городах (адрес_клиента в этом городе), которые начинаются с буквы «a». Сделайте то же самое для городов с символом «-».", """
-        WITH grouped_data AS (
-  SELECT category.name AS category_name, CASE 
-    WHEN city.city LIKE 'a%' THEN 'Starts with a'
-    WHEN city.city LIKE '%-%' THEN 'Contains hyphen'
-  END AS city_group,
-  SUM(film.length) / 60.0 AS total_hours
-    FROM (category JOIN (film_category JOIN (film JOIN (inventory JOIN (rental JOIN (customer JOIN (address JOIN city ON address.city_id = city.city_id)
-                                                                                     ON customer.address_id = address.address_id)
-                                                                        ON rental.customer_id = customer.customer_id)
-                                                        ON inventory.inventory_id = rental.inventory_id)
-                                            ON film.film_id = inventory.film_id)
-                         ON film_category.film_id = film.film_id)
-    ON category.category_id = film_category.category_id)
-    WHERE city.city LIKE 'a%' OR city.city LIKE '%-%'
-	GROUP BY city_group, category_name
-), 
+    # В Spark лучшая категория группы выбирается агрегатом max_by за один проход
+    # вместо оконной функции; в PostgreSQL нет max_by, там используется ROW_NUMBER.
+    # При равенстве часов оба варианта возвращают одну строку на группу -
+    # категорию с наибольшим названием, а не все равные категории.
+    ("7. Выведите категорию фильмов с наибольшим общим количеством часов проката в городах (адрес_клиента в этом городе), которые начинаются с буквы «a». Сделайте то же самое для городов с символом «-».", GROUPED_HOURS_CTE + """
+  SELECT city_group, MAX_BY(category_name, struct(total_minutes, category_name)) AS category_name, MAX(total_minutes) / 60.0 AS total_hours
+    FROM grouped_data
+    GROUP BY city_group
+    ORDER BY city_group
+    """, GROUPED_HOURS_CTE + """,
 ranked_data AS (
-  SELECT city_group, category_name, total_hours, DENSE_RANK() OVER (PARTITION BY city_group ORDER BY total_hours DESC) AS rnk
+  SELECT city_group, category_name, total_minutes, ROW_NUMBER() OVER (PARTITION BY city_group ORDER BY total_minutes DESC, category_name DESC) AS rnk
     FROM grouped_data
 )
 
-  SELECT city_group, category_name, total_hours
+  SELECT city_group, category_name, total_minutes / 60.0 AS total_hours
     FROM ranked_data
     WHERE rnk = 1
     ORDER BY city_group
-    """)
+    """),
+)
+
+# Результат печатается в формате DataFrame.show(truncate=False), но из уже
+# собранных строк, без отдельного задания Spark на вывод.
+SHOW_ROWS = 20
+
+def format_table(columns, rows):
+    cells = [["null" if value is None else str(value) for value in row] for row in rows[:SHOW_ROWS]]
+    widths = [max([3, len(name)] + [len(row[i]) for row in cells]) for i, name in enumerate(columns)]
+    border = "+" + "+".join("-" * width for width in widths) + "+"
+    lines = [border, "|" + "|".join(name.ljust(width) for name, width in zip(columns, widths)) + "|", border]
+    lines += ["|" + "|".join(cell.ljust(width) for cell, width in zip(row, widths)) + "|" for row in cells]
+    lines.append(border)
+    if len(rows) > SHOW_ROWS:
+        lines.append(f"only showing top {SHOW_ROWS} rows")
+    return "\n".join(lines) + "\n\n"
+
+def _validate_env():
+    # Проверки окружения выполняются до запуска JVM, чтобы не поднимать Spark впустую.
+    if not os.path.exists(JDBC_DRIVER_PATH):
+        print(f"[КРИТИЧЕСКАЯ ОШИБКА] JDBC драйвер не найден: {JDBC_DRIVER_PATH}")
+        sys.exit(1)
+    return JDBC_DRIVER_PATH
+
+def _build_session(driver_path):
+    return SparkSession.builder \
+        .appName("Pagila SQL Analysis") \
+        .config("spark.jars", driver_path) \
+        .config("spark.driver.extraClassPath", driver_path) \
+        .config("spark.sql.autoBroadcastJoinThreshold", 67108864) \
+        .config("spark.sql.adaptive.enabled", "true") \
+        .config("spark.sql.adaptive.localShuffleReader.enabled", "true") \
+        .config("spark.sql.adaptive.coalescePartitions.enabled", "true") \
+        .config("spark.sql.adaptive.coalescePartitions.initialPartitionNum", SHUFFLE_PARTITIONS) \
+        .config("spark.sql.adaptive.skewJoin.enabled", "true") \
+        .config("spark.sql.adaptive.skewJoin.skewedPartitionFactor", 5) \
+        .config("spark.sql.join.preferSortMergeJoin", "false") \
+        .config("spark.sql.adaptive.advisoryPartitionSizeInBytes", "16MB") \
+        .config("spark.sql.adaptive.maxShuffledHashJoinLocalMapThreshold", "16MB") \
+        .config("spark.sql.shuffle.partitions", SHUFFLE_PARTITIONS) \
+        .config("spark.serializer", "org.apache.spark.serializer.KryoSerializer") \
+        .config("spark.kryo.registrationRequired", "false") \
+        .config("spark.kryo.classesToRegister", "org.apache.spark.sql.catalyst.expressions.UnsafeRow") \
+        .config("spark.kryoserializer.buffer.max", "64m") \
+        .config("spark.memory.offHeap.enabled", "true") \
+        .config("spark.memory.offHeap.size", "512m") \
+        .config("spark.scheduler.mode", "FAIR") \
+        .getOrCreate()
+
+def main():
+    print("[ИНФО] Запуск Python скрипта внутри Docker...")
+    driver_path = _validate_env()
+    spark = _build_session(driver_path)
+
+    spark.sparkContext.setLogLevel("WARN")
+
+    jdbc_url = "jdbc:postgresql://pagila:5432/postgres"
+
+    db_properties = {
+        "user": "postgres",
+        "password": "123456",
+        "driver": "org.postgresql.Driver",
+        "fetchsize": "10000"
+    }
+
+    # Запросы отправляются в PostgreSQL как подзапросы: соединения и агрегации
+    # выполняются на стороне БД, а в Spark приходит только итоговый результат.
+    def pg_query(sql_query):
+        return spark.read.jdbc(url=jdbc_url, table=f"({sql_query}) AS sub", properties=db_properties)
+
+    if PUSHDOWN_TO_POSTGRES:
+        execute = pg_query
+        print("\n[ИНФО] Запросы выполняются в базе данных через JDBC...\n")
+    else:
+        # Из каждой таблицы читаются только столбцы, которые используются в запросах.
+        tables_to_load = {
+            "actor": "actor_id, first_name, last_name",
+            "category": "category_id, name",
+            "film": "film_id, title, length",
+            "film_actor": "actor_id, film_id",
+            "film_category": "film_id, category_id",
+            "inventory": "inventory_id, film_id",
+            "rental": "rental_id, inventory_id, customer_id",
+            "payment": "rental_id, amount",
+            "customer": "customer_id, address_id, activebool",
+            "address": "address_id, city_id",
+            "city": "city_id, city"
+        }
+
+        # Таблицы фактов читаются параллельно: диапазон ключа делится на numPartitions запросов.
+        partitioned_tables = {
+            "rental": ("rental_id", 20000),
+            "payment": ("rental_id", 20000),
+            "inventory": ("inventory_id", 5000)
+        }
+        num_partitions = spark.sparkContext.defaultParallelism
+
+        # rental и inventory один раз распределяются по inventory_id и сохраняются
+        # в памяти исполнителей, поэтому их соединение в запросах 2, 3 и 7 обходится
+        # без повторного shuffle: во всех трех оно стоит первым в списке FROM. Остальные таблицы либо рассылаются broadcast, либо
+        # не соединяются по общему ключу; они кэшируются в сериализованном виде, чтобы
+        # все запросы читали их из памяти, а не заново через JDBC.
+        copartitioned_tables = {
+            "rental": "inventory_id",
+            "inventory": "inventory_id"
+        }
+
+        def load_table(table):
+            query = f"(SELECT {tables_to_load[table]} FROM public.{table}) AS {table}"
+            if table in partitioned_tables:
+                column, upper_bound = partitioned_tables[table]
+                df = spark.read.jdbc(url=jdbc_url, table=query, column=column, lowerBound=1,
+                                     upperBound=upper_bound, numPartitions=num_partitions,
+                                     properties=db_properties)
+            else:
+                df = spark.read.jdbc(url=jdbc_url, table=query, properties=db_properties)
+            if table in copartitioned_tables:
+                df = df.repartition(SHUFFLE_PARTITIONS, copartitioned_tables[table]).localCheckpoint()
+            else:
+                df = df.persist(StorageLevel.MEMORY_ONLY)
+                df.count()
+            return table, df
+
+        try:
+            print("\n[ИНФО] Подключение к базе данных и загрузка таблиц...")
+            # Таблицы загружаются параллельно, каждая через собственное JDBC соединение.
+            with ThreadPoolExecutor(max_workers=min(8, len(tables_to_load))) as executor:
+                for table, df in executor.map(load_table, tables_to_load):
+                    df.createOrReplaceTempView(table)
+            print("[ИНФО] Все таблицы успешно загружены и готовы к запросам!\n")
+
+        except Exception as e:
+            print(f"\n[КРИТИЧЕСКАЯ ОШИБКА] Не удалось подключиться к базе данных.\nДетали ошибки: {e}")
+            spark.stop()
+            sys.exit(1)
+
+        execute = spark.sql
+
+    queries = [
+        (title, pg_sql_query if PUSHDOWN_TO_POSTGRES and pg_sql_query else query)
+        for title, query, pg_sql_query in QUERIES
+    ]
+
+    # Запросы выполняются параллельно и делят закэшированные таблицы; каждый поток
+    # получает свой пул FAIR планировщика, чтобы задания делили исполнители, а не
+    # выстраивались в очередь FIFO пула default. Результаты собираются на драйвер
+    # и выводятся в исходном порядке.
+    def fetch_query(item):
+        title, query = item
+        spark.sparkContext.setLocalProperty("spark.scheduler.pool", title)
+        try:
+            df = query(spark) if callable(query) else execute(query)
+            return title, format_table(df.columns, df.take(SHOW_ROWS + 1)), None
+        except Exception as e:
+            return title, None, e
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for title, result, error in executor.map(fetch_query, queries):
+            sys.stdout.write(f"--- {title} ---\n")
+            if error is None:
+                sys.stdout.write(result)
+            else:
+                sys.stdout.write(f"Ошибка выполнения запроса: {error}\n")
+            sys.stdout.write("-" * 50 + "\n\n")
 
     print("[ИНФО] Все запросы выполнены. Завершение работы Spark...")
+    spark.catalog.clearCache()
     spark.stop()
 
 if __name__ == "__main__":